@@ -1,6 +1,9 @@
 """主程序：将 PDF 转换为 PNG 图片，然后逐张调用截图工具进行处理"""
 
+import multiprocessing
 from notebooklm2ppt.cli import main
 
 if __name__ == "__main__":
+    # PyInstaller 打包后，子进程（PDF 并行渲染）需要此调用才能正常启动
+    multiprocessing.freeze_support()
     main()
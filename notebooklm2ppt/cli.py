@@ -16,7 +16,7 @@ from .i18n import get_text
 
 
 def process_pdf_to_ppt(pdf_path, png_dir, ppt_dir, delay_between_images=2, inpaint=True, dpi=150, timeout=50, display_height=None, 
-                    display_width=None, done_button_offset=None, capture_done_offset: bool = True, pages=None, update_offset_callback=None, stop_flag=None, force_regenerate=False, inpaint_method='background_smooth', top_left=(0, 0)):
+                    display_width=None, done_button_offset=None, capture_done_offset: bool = True, pages=None, update_offset_callback=None, stop_flag=None, force_regenerate=False, inpaint_method='background_smooth', top_left=(0, 0), pages_from=None, progress_cb=None):
     """
     将 PDF 转换为 PNG 图片，然后对每张图片进行截图处理
     
@@ -38,6 +38,8 @@ def process_pdf_to_ppt(pdf_path, png_dir, ppt_dir, delay_between_images=2, inpai
         force_regenerate: 是否强制重新生成所有 PPT（默认 False，复用已存在的 PPT）
         inpaint_method: 修复方法，可选值: background_smooth, edge_mean_smooth, background, onion, griddata, skimage
         top_left: 截图区域的左上角坐标 (x, y)
+        pages_from: 从该页起一直处理到末页（可与 pages 组合使用）
+        progress_cb: PDF 转 PNG 的进度回调 progress_cb(done, total)
     """
     # 1. 将 PDF 转换为 PNG 图片
     print("=" * 60)
@@ -48,7 +50,7 @@ def process_pdf_to_ppt(pdf_path, png_dir, ppt_dir, delay_between_images=2, inpai
         print(f"错误: PDF 文件 {pdf_path} 不存在")
         return
     
-    png_names = pdf_to_png(pdf_path, png_dir, dpi=dpi, inpaint=inpaint, pages=pages, inpaint_method=inpaint_method, force_regenerate=force_regenerate)
+    png_names = pdf_to_png(pdf_path, png_dir, dpi=dpi, inpaint=inpaint, pages=pages, pages_from=pages_from, inpaint_method=inpaint_method, force_regenerate=force_regenerate, progress_cb=progress_cb)
     
     # 创建ppt输出目录
     ppt_dir.mkdir(exist_ok=True, parents=True)
@@ -32,6 +32,14 @@ CONFIG_FILE = Path("./config.json")
 BASE_WINDOWS_DPI = 85
 
 
+def read_config_file():
+    """读取配置文件，文件不存在时返回空字典"""
+    if not CONFIG_FILE.exists():
+        return {}
+    with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def icon_path():
     """获取资源绝对路径，适用于PyInstaller打包后"""
     try:
@@ -92,16 +100,85 @@ def enable_windows_dpi_awareness(root=None):
         pass
 
 
+def parse_page_range(range_str):
+    """
+    解析页码范围字符串，如 "1,3-5,8-"
+    
+    返回 None（未指定，处理全部页），或 (pages, pages_from)：
+    pages 为显式指定的页码列表（升序）；pages_from 为开放区间 "N-" 的起始页，
+    表示从该页一直处理到末页，没有开放区间时为 None。
+    """
+    if not range_str:
+        return None
+    pages = set()
+    pages_from = None
+    # 将中文逗号替换为英文逗号
+    range_str = range_str.replace('，', ',')
+    # 将各种中文破折号替换为英文连字符
+    range_str = range_str.replace('—', '-').replace('–', '-').replace('－', '-')
+    for part in [p.strip() for p in range_str.split(',') if p.strip()]:
+        if '-' in part:
+            start_end = part.split('-')
+            if start_end[0] == '':
+                continue
+            start = int(start_end[0])
+            if start_end[1] == '':
+                # 开放区间只需记录起点，多个开放区间取最小起点
+                pages_from = start if pages_from is None else min(pages_from, start)
+            else:
+                end = int(start_end[1])
+                if end >= start:
+                    pages.update(range(start, end + 1))
+        else:
+            pages.add(int(part))
+    if pages_from is not None:
+        # 已被开放区间覆盖的页码无需单独记录，紧邻的连续页并入开放区间
+        pages = {p for p in pages if p < pages_from}
+        while pages_from - 1 in pages:
+            pages.discard(pages_from - 1)
+            pages_from -= 1
+    return sorted(pages), pages_from
+
+
+def format_page_suffix(pages, pages_from=None):
+    """将页码列表（及开放区间起点）转换为文件名后缀，如 "_p1,3-5,8-" """
+    if not pages and pages_from is None:
+        return ""
+    pages = pages or []
+    result = []
+    i = 0
+    while i < len(pages):
+        start = pages[i]
+        end = start
+        while i + 1 < len(pages) and pages[i + 1] == end + 1:
+            i += 1
+            end = pages[i]
+        if start == end:
+            result.append(str(start))
+        else:
+            result.append(f"{start}-{end}")
+        i += 1
+    if pages_from is not None:
+        result.append(f"{pages_from}-")
+    return f"_p{','.join(result)}"
+
+
+# 日志区最多保留的行数，避免 Text 控件无限增长拖慢插入
+MAX_LOG_LINES = 5000
+# 日志批量刷新间隔（毫秒）
+LOG_FLUSH_INTERVAL_MS = 50
+
+
 class TextRedirector:
-    def __init__(self, widget, tag="stdout"):
-        self.widget = widget
+    """将 stdout/stderr 写入线程安全的队列，由 Tk 主线程定时取出显示"""
+    def __init__(self, log_queue, tag="stdout"):
+        self.log_queue = log_queue
         self.tag = tag
 
     def write(self, str):
-        self.widget.configure(state='normal')
-        self.widget.insert(tk.END, str, (self.tag,))
-        self.widget.see(tk.END)
-        self.widget.configure(state='disabled')
+        # 工作线程中只入队，不直接操作 Tk 控件
+        if str:
+            self.log_queue.put((self.tag, str))
 
     def flush(self):
         pass
@@ -116,6 +193,9 @@ class AppGUI:
         self._drop_queue = queue.Queue()
         self._poll_drop_queue()
         
+        # 日志队列：工作线程写入，主线程批量刷新到日志区
+        self._log_queue = queue.Queue()
+        
         self.load_config_from_disk()
         set_language(self.lang)
         
@@ -138,8 +218,9 @@ class AppGUI:
         self.old_stderr = sys.stderr
         
         # Redirect stdout and stderr
-        sys.stdout = TextRedirector(self.log_area, "stdout")
-        sys.stderr = TextRedirector(self.log_area, "stderr")
+        sys.stdout = TextRedirector(self._log_queue, "stdout")
+        sys.stderr = TextRedirector(self._log_queue, "stderr")
+        self._poll_log_queue()
         
         # 主界面不再支持拖拽功能
         # if windnd:
@@ -173,6 +254,33 @@ class AppGUI:
             # 每100ms轮询一次
             self.root.after(100, self._poll_drop_queue)
 
+    def _poll_log_queue(self):
+        """轮询日志队列，将积累的输出合并为一次插入"""
+        chunks = []
+        try:
+            while True:
+                tag, text = self._log_queue.get_nowait()
+                if chunks and chunks[-1][0] == tag:
+                    chunks[-1][1].append(text)
+                else:
+                    chunks.append((tag, [text]))
+        except queue.Empty:
+            pass
+
+        if chunks and hasattr(self, 'log_area'):
+            try:
+                self.log_area.configure(state='normal')
+                for tag, texts in chunks:
+                    self.log_area.insert(tk.END, ''.join(texts), (tag,))
+                self.log_area.delete("1.0", f"end-{MAX_LOG_LINES} lines")
+                self.log_area.see(tk.END)
+                self.log_area.configure(state='disabled')
+            except tk.TclError:
+                # 日志区正在重建（如切换语言），丢弃本批输出
+                pass
+
+        self.root.after(LOG_FLUSH_INTERVAL_MS, self._poll_log_queue)
+
     def _setup_path_entry(self, entry):
         """为路径输入框添加右键菜单、全选和自动滚动功能"""
         self.add_context_menu(entry)
@@ -270,9 +378,6 @@ class AppGUI:
                 widget.destroy()
         
         self.setup_ui()
-        # 重新重定向 stdout/stderr 到新的 log_area
-        sys.stdout = TextRedirector(self.log_area, "stdout")
-        sys.stderr = TextRedirector(self.log_area, "stderr")
 
     def add_context_menu(self, widget):
         """为输入框添加右键菜单（剪切、复制、粘贴、全选）"""
@@ -434,6 +539,15 @@ class AppGUI:
         ttk.Button(queue_btns, text=get_text("queue_remove_selected"), command=self.remove_selected_task).pack(side=tk.LEFT, padx=5)
         ttk.Button(queue_btns, text=get_text("queue_clear"), command=self.clear_tasks).pack(side=tk.LEFT, padx=5)
 
+        # 图片生成进度（由转换线程经 root.after 更新）
+        progress_frame = ttk.Frame(queue_frame)
+        progress_frame.grid(row=2, column=0, columnspan=6, sticky="ew", pady=(8, 0))
+        progress_frame.columnconfigure(0, weight=1)
+        self.progress_var = tk.DoubleVar(value=0)
+        ttk.Progressbar(progress_frame, variable=self.progress_var, maximum=100).grid(row=0, column=0, sticky="ew")
+        self.progress_text_var = tk.StringVar(value="")
+        ttk.Label(progress_frame, textvariable=self.progress_text_var, width=24).grid(row=0, column=1, sticky=tk.W, padx=5)
+
         # Log Area
         log_frame = ttk.LabelFrame(main_frame, text=get_text("log_area_label"), padding="5")
         log_frame.pack(fill=tk.BOTH, expand=True, pady=5)
@@ -501,48 +615,50 @@ class AppGUI:
         btn_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=8, pady=6)
         ttk.Button(btn_frame, text=get_text("close_btn"), command=top.destroy).pack(side=tk.LEFT, padx=6)
 
-    def ensure_pc_manager_running(self):
+    def check_pc_manager_running(self):
+        """检测电脑管家是否运行（调用 tasklist，耗时较长，应在工作线程中调用）
+
+        返回 (是否运行, 检测失败时的异常)
+        """
         if sys.platform != "win32":
-            return True
+            return True, None
         try:
-            running = is_process_running(PROCESS_NAME)
+            return is_process_running(PROCESS_NAME), None
         except Exception as e:
+            return False, e
+
+    def prompt_pc_manager_not_running(self, error=None):
+        """在主线程中提示电脑管家未运行或检测失败"""
+        if error is not None:
             messagebox.showerror(
                 get_text("error_btn"),
-                f"检测电脑管家运行状态失败: {e}",
+                f"检测电脑管家运行状态失败: {error}",
             )
-            return False
-        if not running:
-            full_msg = (
-                get_text("pc_manager_not_running_msg")
-                + "\n\n"
-                + get_text("pc_manager_open_website_confirm")
-            )
-            open_site = messagebox.askyesno(
-                get_text("error_btn"),
-                full_msg,
-            )
-            if open_site:
-                try:
-                    webbrowser.open_new_tab(PC_MANAGER_URL)
-                except Exception as e:
-                    messagebox.showerror(
-                        get_text("error_btn"),
-                        get_text("open_pc_manager_website_error", error=str(e)),
-                    )
-            return False
-        return True
+            return
+        full_msg = (
+            get_text("pc_manager_not_running_msg")
+            + "\n\n"
+            + get_text("pc_manager_open_website_confirm")
+        )
+        open_site = messagebox.askyesno(
+            get_text("error_btn"),
+            full_msg,
+        )
+        if open_site:
+            try:
+                webbrowser.open_new_tab(PC_MANAGER_URL)
+            except Exception as e:
+                messagebox.showerror(
+                    get_text("error_btn"),
+                    get_text("open_pc_manager_website_error", error=str(e)),
+                )
 
 
 
     def dump_config_to_disk(self):
         # 首先读取现有的配置，保留 hide_startup_dialog 等其他字段
         try:
-            if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    config_data = json.load(f)
-            else:
-                config_data = {}
+            config_data = read_config_file()
         except Exception:
             config_data = {}
         
@@ -568,28 +684,47 @@ class AppGUI:
             if not CONFIG_FILE.exists():
                 self.last_task_settings = {}  # 初始化为空字典
                 return
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                self.lang = config_data.get("language", "zh_cn")
-                # 加载用户上次使用的任务设置
-                self.last_task_settings = config_data.get("last_task_settings", {})
-                if hasattr(self, 'output_dir_var'):
-                    self.output_dir_var.set(config_data.get("output_dir", "workspace"))
-                    self.delay_var.set(config_data.get("delay", 0))
-                    self.timeout_var.set(config_data.get("timeout", 50))
-                    offset_value = config_data.get("done_offset", "")
-                    self.update_offset_related_gui(offset_value)
-                    
-                    # 确保加载配置后滚动到末尾以显示文件名
-                    if hasattr(self, 'output_entry'):
-                        self.root.after(100, lambda: self.output_entry.xview_moveto(1.0))
+            config_data = read_config_file()
+            self.lang = config_data.get("language", "zh_cn")
+            # 加载用户上次使用的任务设置
+            self.last_task_settings = config_data.get("last_task_settings", {})
+            if hasattr(self, 'output_dir_var'):
+                self.output_dir_var.set(config_data.get("output_dir", "workspace"))
+                self.delay_var.set(config_data.get("delay", 0))
+                self.timeout_var.set(config_data.get("timeout", 50))
+                offset_value = config_data.get("done_offset", "")
+                self.update_offset_related_gui(offset_value)
+                
+                # 确保加载配置后滚动到末尾以显示文件名
+                if hasattr(self, 'output_entry'):
+                    self.root.after(100, lambda: self.output_entry.xview_moveto(1.0))
         except Exception as e:
             print(get_text("config_load_fail", error=str(e)))
             self.dump_config_to_disk()
             print(get_text("default_config_created"))
 
 
+    def report_render_progress(self, done, total):
+        """PDF 转 PNG 进度回调，在转换线程中触发，界面更新交给 Tk 主线程"""
+        self.root.after(0, self._apply_render_progress, done, total)
+
+    def _apply_render_progress(self, done, total):
+        self.progress_var.set(100 * done / total if total else 100)
+        self.progress_text_var.set(get_text("render_progress", done=done, total=total))
+
+    def reset_render_progress(self):
+        """新任务开始时清空进度条，避免全部命中缓存时仍显示上一个任务的进度"""
+        self.root.after(0, self._apply_render_progress_reset)
+
+    def _apply_render_progress_reset(self):
+        self.progress_var.set(0)
+        self.progress_text_var.set("")
+
     def update_offset_disk(self, offset_value):
+        # 该回调在转换线程中触发，界面变量与配置写入统一交给 Tk 主线程执行
+        self.root.after(0, self._apply_offset, offset_value)
+
+    def _apply_offset(self, offset_value):
         self.done_offset_var.set(str(offset_value))
         self.dump_config_to_disk()
         self.update_offset_related_gui(offset_value)
@@ -716,58 +851,16 @@ class AppGUI:
 
             print(get_text("start_processing", file=pdf_file))
 
-            # 解析页范围
-            def parse_page_range(range_str):
-                if not range_str:
-                    return None
-                pages = set()
-                # 将中文逗号替换为英文逗号
-                range_str = range_str.replace('，', ',')
-                # 将各种中文破折号替换为英文连字符
-                range_str = range_str.replace('—', '-').replace('–', '-').replace('－', '-')
-                for part in [p.strip() for p in range_str.split(',') if p.strip()]:
-                    if '-' in part:
-                        start_end = part.split('-')
-                        if start_end[0] == '':
-                            continue
-                        start = int(start_end[0])
-                        if start_end[1] == '':
-                            pages.update(range(start, start + 10000))
-                        else:
-                            end = int(start_end[1])
-                            if end >= start:
-                                pages.update(range(start, end + 1))
-                    else:
-                        pages.add(int(part))
-                return sorted(pages)
-
-            # 将页码列表转换为字符串格式
-            def format_page_suffix(pages):
-                if not pages:
-                    return ""
-                result = []
-                i = 0
-                while i < len(pages):
-                    start = pages[i]
-                    end = start
-                    while i + 1 < len(pages) and pages[i + 1] == end + 1:
-                        i += 1
-                        end = pages[i]
-                    if start == end:
-                        result.append(str(start))
-                    else:
-                        result.append(f"{start}-{end}")
-                    i += 1
-                return f"_p{','.join(result)}"
-
-            pages_list = None
+            pages_list, pages_from = None, None
             try:
-                pages_list = parse_page_range(self.page_range_var.get().strip())
+                page_selection = parse_page_range(self.page_range_var.get().strip())
+                if page_selection is not None:
+                    pages_list, pages_from = page_selection
             except Exception as e:
                 raise ValueError(get_text("page_range_error"))
             
             # 根据页码范围生成文件名后缀
-            page_suffix = format_page_suffix(pages_list)
+            page_suffix = format_page_suffix(pages_list, pages_from)
             out_ppt_file = workspace_dir / f"{pdf_name}{page_suffix}.pptx"
             
             method_id = self.get_method_id_from_translated_name(self.inpaint_method_var.get())
@@ -784,6 +877,8 @@ class AppGUI:
                     dpi=self.dpi_var.get(),
                     inpaint=self.inpaint_var.get(),
                     pages=pages_list,
+                    pages_from=pages_from,
+                    progress_cb=self.report_render_progress,
                     inpaint_method=method_id,
                     force_regenerate=self.force_regenerate_var.get()
                 )
@@ -809,6 +904,8 @@ class AppGUI:
                     done_button_offset=done_offset,
                     capture_done_offset=self.calibrate_var.get(),
                     pages=pages_list,
+                    pages_from=pages_from,
+                    progress_cb=self.report_render_progress,
                     update_offset_callback=self.update_offset_disk,
                     stop_flag=lambda: self.stop_flag,
                     force_regenerate=self.force_regenerate_var.get(),
@@ -2256,17 +2353,12 @@ class AppGUI:
 
         # 检查是否有任务需要自动化（非仅图片模式）
         has_automation_task = any(not task.get("settings", {}).get("image_only", False) for task in self.task_queue)
-        if has_automation_task:
-            if not self.ensure_pc_manager_running():
-                return
-        if not self.task_queue:
-            messagebox.showinfo(get_text("info_btn"), get_text("queue_empty_msg"))
-            return
         self.queue_stop_flag = False
         self.is_queue_running = True
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
-        threading.Thread(target=self.process_queue, daemon=True).start()
+        # 电脑管家检测和文件检查都在工作线程中进行，避免阻塞界面
+        threading.Thread(target=self.process_queue, args=(has_automation_task,), daemon=True).start()
 
     def stop_queue(self):
         if not self.is_queue_running:
@@ -2275,18 +2367,32 @@ class AppGUI:
         print(get_text("queue_stopping"))
         self.stop_btn.config(state=tk.DISABLED)
 
-    def process_queue(self):
+    def _update_task_row_async(self, task):
+        """从工作线程请求刷新任务行，实际更新在 Tk 主线程执行"""
+        self.root.after(0, self.update_task_row, task)
+
+    def _on_queue_finished(self):
+        self.is_queue_running = False
+        self.start_btn.config(state=tk.NORMAL)
+        self.stop_btn.config(state=tk.DISABLED)
+
+    def process_queue(self, need_pc_manager=False):
         try:
+            if need_pc_manager:
+                running, error = self.check_pc_manager_running()
+                if not running:
+                    self.root.after(0, self.prompt_pc_manager_not_running, error)
+                    return
             print(get_text("queue_started"))
             for task in list(self.task_queue):
                 if self.queue_stop_flag:
                     break
                 if not os.path.exists(task["pdf"]):
                     task["status"] = get_text("queue_status_error")
-                    self.update_task_row(task)
+                    self._update_task_row_async(task)
                     continue
                 task["status"] = get_text("queue_status_running")
-                self.update_task_row(task)
+                self._update_task_row_async(task)
                 ok, output_files = self.run_conversion_for_task(task)
                 if ok and output_files:
                     # output_files is a tuple: (unoptimized_file, optimized_file)
@@ -2298,17 +2404,16 @@ class AppGUI:
                     task["output_optimized"] = ""
                     task["output"] = ""
                 task["status"] = get_text("queue_status_done") if ok else get_text("queue_status_error")
-                self.update_task_row(task)
+                self._update_task_row_async(task)
             if self.queue_stop_flag:
                 print(get_text("queue_stopped"))
             else:
                 print(get_text("queue_finished"))
         finally:
-            self.is_queue_running = False
-            self.start_btn.config(state=tk.NORMAL)
-            self.stop_btn.config(state=tk.DISABLED)
+            self.root.after(0, self._on_queue_finished)
 
     def run_conversion_for_task(self, task):
+        self.reset_render_progress()
         try:
             pdf_file = task["pdf"]
             mineru_json = task["json"]
@@ -2352,53 +2457,15 @@ class AppGUI:
             display_width = int(max_display_width * ratio_val)
             display_height = int(max_display_height * ratio_val)
             
-            def parse_page_range(range_str):
-                if not range_str:
-                    return None
-                pages = set()
-                range_str = range_str.replace('，', ',')
-                range_str = range_str.replace('—', '-').replace('–', '-').replace('－', '-')
-                for part in [p.strip() for p in range_str.split(',') if p.strip()]:
-                    if '-' in part:
-                        start_end = part.split('-')
-                        if start_end[0] == '':
-                            continue
-                        start = int(start_end[0])
-                        if start_end[1] == '':
-                            pages.update(range(start, start + 10000))
-                        else:
-                            end = int(start_end[1])
-                            if end >= start:
-                                pages.update(range(start, end + 1))
-                    else:
-                        pages.add(int(part))
-                return sorted(pages)
-                
-            def format_page_suffix(pages):
-                if not pages:
-                    return ""
-                result = []
-                i = 0
-                while i < len(pages):
-                    start = pages[i]
-                    end = start
-                    while i + 1 < len(pages) and pages[i + 1] == end + 1:
-                        i += 1
-                        end = pages[i]
-                    if start == end:
-                        result.append(str(start))
-                    else:
-                        result.append(f"{start}-{end}")
-                    i += 1
-                return f"_p{','.join(result)}"
-            
-            pages_list = None
+            pages_list, pages_from = None, None
             try:
-                pages_list = parse_page_range(page_range)
+                page_selection = parse_page_range(page_range)
+                if page_selection is not None:
+                    pages_list, pages_from = page_selection
             except Exception:
-                pages_list = None
+                pages_list, pages_from = None, None
                 
-            page_suffix = format_page_suffix(pages_list)
+            page_suffix = format_page_suffix(pages_list, pages_from)
             out_ppt_file = workspace_dir / f"{pdf_name}{page_suffix}.pptx"
             
             # 如果 inpaint_method 已经是 ID 格式，直接使用；否则转换
@@ -2414,6 +2481,8 @@ class AppGUI:
                     dpi=dpi,
                     inpaint=inpaint,
                     pages=pages_list,
+                    pages_from=pages_from,
+                    progress_cb=self.report_render_progress,
                     inpaint_method=method_id,
                     force_regenerate=force_regenerate
                 )
@@ -2434,6 +2503,8 @@ class AppGUI:
                     done_button_offset=done_offset,
                     capture_done_offset=calibrate,
                     pages=pages_list,
+                    pages_from=pages_from,
+                    progress_cb=self.report_render_progress,
                     update_offset_callback=self.update_offset_disk,
                     stop_flag=lambda: self.queue_stop_flag,
                     force_regenerate=force_regenerate,
@@ -86,6 +86,7 @@ TRANSLATIONS = {
     ),
     "open_mineru_website": "Open MinerU Website",
     "start_processing": "Starting process: {file}",
+    "render_progress": "Rendering images: {done}/{total}",
     "page_range_error": "Page range format error, please use formats like 1-3,5,7-",
     "image_only_mode_start": "Image Only Mode: Directly inserting PNG images into PPT",
     "conversion_stopped_msg": "Conversion stopped by user",
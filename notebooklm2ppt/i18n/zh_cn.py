@@ -86,6 +86,7 @@ TRANSLATIONS = {
     ),
     "open_mineru_website": "打开 MinerU 网站",
     "start_processing": "开始处理: {file}",
+    "render_progress": "生成图片: {done}/{total} 页",
     "page_range_error": "页范围格式错误，请使用 1-3,5,7- 类似格式",
     "image_only_mode_start": "仅图片模式：直接将PNG图片插入PPT",
     "conversion_stopped_msg": "转换已被用户停止",
@@ -1,10 +1,131 @@
 import fitz  # PyMuPDF
 import os
+import sys
+import json
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from .utils.image_inpainter import inpaint_image, INPAINT_METHODS
+import numpy as np
+from .utils.image_inpainter import inpaint_array, INPAINT_METHODS
 from PIL import Image
 
-def pdf_to_png(pdf_path, output_dir=None, dpi=150, inpaint=False, pages=None, inpaint_method='background_smooth', force_regenerate=False, make_wide_screen=False):
+# 中间 PNG 会被立即读取使用，采用最低压缩等级以换取编码速度（像素数据不变）
+FAST_PNG_OPTIONS = {"compress_level": 1, "optimize": False}
+
+# 进度回报的最短间隔（秒），避免逐页输出刷屏
+PROGRESS_INTERVAL = 0.5
+
+# 输出目录中记录各 PNG 生成参数的缓存文件
+PNG_CACHE_FILE = ".cache.json"
+
+# Windows 上 ProcessPoolExecutor 的 max_workers 不能超过 61
+WINDOWS_MAX_WORKERS = 61
+
+
+def _make_wide_screen_array(arr):
+    """将 RGB 图像数组居中填充（白色）或裁剪为 16:9 宽屏"""
+    height, width = arr.shape[:2]
+    target_width = round(height * 16 / 9)
+    if target_width > width:
+        # 需要扩展宽度
+        out = np.full((height, target_width, 3), 255, dtype=np.uint8)
+        offset = (target_width - width) // 2
+        out[:, offset:offset + width] = arr
+        return out
+    if target_width < width:
+        # 需要裁剪宽度
+        left = (width - target_width) // 2
+        return arr[:, left:left + target_width]
+    return arr
+
+def _render_page(pdf_path, page_num, zoom, output_path, inpaint, inpaint_method, make_wide_screen, fast_png=True):
+    """
+    渲染单页并保存为 PNG（在子进程中执行）
+    
+    每次调用都独立打开 PDF，PyMuPDF 文档对象不能跨进程共享。
+    """
+    with fitz.open(pdf_path) as pdf_doc:
+        page = pdf_doc[page_num - 1]
+        # 渲染页面为图片
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+
+    save_options = FAST_PNG_OPTIONS if fast_png else {}
+    if not inpaint and not make_wide_screen:
+        if fast_png:
+            pix.pil_save(output_path, format="PNG", **save_options)
+        else:
+            pix.save(output_path)
+        return output_path
+
+    # 需要后处理时直接在内存中操作像素，整页只编码一次 PNG；
+    # samples_mv 是 pixmap 缓冲区的只读视图，比 samples 少一次整页拷贝
+    arr = np.frombuffer(pix.samples_mv, dtype=np.uint8).reshape(pix.height, pix.width, 3)
+    if inpaint:
+        arr = inpaint_array(arr.copy(), inpaint_method=inpaint_method)
+
+    if make_wide_screen:
+        arr = _make_wide_screen_array(arr)
+
+    Image.fromarray(arr).save(output_path, **save_options)
+    return output_path
+
+
+def _png_cache_key(pdf_path, dpi, inpaint, inpaint_method, make_wide_screen):
+    """根据 PDF 修改时间和影响像素结果的参数计算缓存键"""
+    stat = os.stat(pdf_path)
+    raw = f"{stat.st_mtime}|{stat.st_size}|{dpi}|{inpaint}|{inpaint_method}|{make_wide_screen}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _load_png_cache(output_dir):
+    try:
+        with open(output_dir / PNG_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_png_cache(output_dir, cache):
+    try:
+        with open(output_dir / PNG_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠ 写入 PNG 缓存失败: {e}")
+
+
+def resolve_max_workers(max_workers=None):
+    """返回进程池可用的进程数：默认取 CPU 核数，Windows 上不超过 WINDOWS_MAX_WORKERS"""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if sys.platform == "win32":
+        max_workers = min(max_workers, WINDOWS_MAX_WORKERS)
+    return max(1, max_workers)
+
+
+def _run_render_jobs(jobs, max_workers=None):
+    """依次产出已保存的 PNG 路径，多页时使用进程池并行渲染"""
+    max_workers = max(1, min(resolve_max_workers(max_workers), len(jobs)))
+    if max_workers == 1:
+        # 单页或限制为单进程时无需启动进程池
+        for job in jobs:
+            yield _render_page(*job)
+    else:
+        # 各页渲染、修复、编码相互独立且为 CPU 密集型，按页并行；
+        # 修复在各页的子进程内完成，因此与其他页的渲染自然重叠
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_render_page, *job) for job in jobs]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                # 调用方提前停止或出错时，取消尚未开始的页面，不再覆盖磁盘上的文件
+                for future in futures:
+                    future.cancel()
+
+
+def pdf_to_png(pdf_path, output_dir=None, dpi=150, inpaint=False, pages=None, inpaint_method='background_smooth', force_regenerate=False, make_wide_screen=False, fast_png=True, max_workers=None, pages_from=None, progress_cb=None, verbose=False):
     """
     将 PDF 文件转换为多个 PNG 图片
     
@@ -14,13 +135,31 @@ def pdf_to_png(pdf_path, output_dir=None, dpi=150, inpaint=False, pages=None, in
         dpi: 分辨率，默认 150
         inpaint: 是否进行图像修复
         pages: 要处理的页码范围
+        pages_from: 从该页起一直处理到末页（可与 pages 组合使用，默认 None）
         inpaint_method: 修复方法，可选值: background_smooth, edge_mean_smooth, background, onion, griddata, skimage
-        force_regenerate: 是否强制重新生成所有 PNG（默认 False，复用已存在的 PNG）
+        force_regenerate: 是否强制重新生成所有 PNG（默认 False，复用以相同参数生成的已存在 PNG）
         make_wide_screen: 是否变为宽屏图片，适应16:9 PPT页面
+        fast_png: 是否以最低压缩等级快速写出 PNG（默认 True，文件稍大但编码快数倍）
+        max_workers: 并行渲染的最大进程数（默认 None，即 CPU 核数）
+        progress_cb: 进度回调 progress_cb(done, total)，按 PROGRESS_INTERVAL 节流调用；默认打印进度行
+        verbose: 是否逐页打印保存/跳过信息（默认 False）
+
+    返回:
+        list: 按页码顺序排列的 PNG 文件名列表
+    """
+    return list(iter_pdf_to_png(pdf_path, output_dir=output_dir, dpi=dpi, inpaint=inpaint, pages=pages,
+                                inpaint_method=inpaint_method, force_regenerate=force_regenerate,
+                                make_wide_screen=make_wide_screen, fast_png=fast_png, max_workers=max_workers,
+                                pages_from=pages_from, progress_cb=progress_cb,
+                                verbose=verbose))
+
+
+def iter_pdf_to_png(pdf_path, output_dir=None, dpi=150, inpaint=False, pages=None, inpaint_method='background_smooth', force_regenerate=False, make_wide_screen=False, fast_png=True, max_workers=None, pages_from=None, progress_cb=None, verbose=False):
+    """
+    pdf_to_png 的流式版本，参数相同；按页码顺序逐个产出 PNG 文件名
+
+    每页 PNG 写完即产出，调用方可以边渲染边处理已完成的页面，无需等待整份 PDF 转换完毕。
     """
-    # 打开 PDF 文件
-    pdf_doc = fitz.open(pdf_path)
-    
     # 确定输出目录
     if output_dir is None:
         pdf_name = Path(pdf_path).stem  # 获取 PDF 文件名（不含扩展名）
@@ -31,63 +170,91 @@ def pdf_to_png(pdf_path, output_dir=None, dpi=150, inpaint=False, pages=None, in
     # 创建输出目录
     output_dir.mkdir(parents=True, exist_ok=True)
     
+    # 读取缓存：PDF 未修改且参数一致时，复用已生成的 PNG 和页数
+    cache_key = _png_cache_key(pdf_path, dpi, inpaint, inpaint_method, make_wide_screen)
+    cache = _load_png_cache(output_dir)
+    cached_files = cache.get("files", {})
+    page_count = cache.get("page_count") if cache.get("key") == cache_key else None
+
+    if page_count is None:
+        # 打开 PDF 文件，仅用于获取页数；各页在子进程中独立渲染
+        with fitz.open(pdf_path) as pdf_doc:
+            page_count = len(pdf_doc)
+    
     # 转换因子：DPI / 72（默认屏幕 DPI）
     zoom = dpi / 72
-    mat = fitz.Matrix(zoom, zoom)
     
-    # 遍历每一页
-    page_count = len(pdf_doc)  # 在关闭文档前获取页数
-    # 规范 pages 参数为集合，方便判断
-    pages_set = None
-    if pages is not None:
-        pages_set = set(pages)
-
-    png_names = []
-    for page_num, page in enumerate(pdf_doc, 1):
-        # 如果指定了 pages，则跳过不在范围内的页码
-        if pages_set is not None and page_num not in pages_set:
-            continue
-        # 渲染页面为图片
-        pix = page.get_pixmap(matrix=mat, alpha=False)
-        
-        # 保存为 PNG
-        output_path = output_dir / f"page_{page_num:04d}.png"
-        
-        png_names.append(output_path.name)
-
-        if not force_regenerate and os.path.exists(output_path):
-            print(f"跳过已存在的文件: {output_path}")
+    # 指定了 pages/pages_from 时只遍历这些页码（忽略超出范围的页），无需逐页判断
+    if pages is None and pages_from is None:
+        selected_nums = range(1, page_count + 1)
+    else:
+        pages_set = {n for n in (pages or ()) if 1 <= n <= page_count}
+        if pages_from is not None:
+            pages_set.update(range(max(pages_from, 1), page_count + 1))
+        selected_nums = sorted(pages_set)
+
+    # 预先生成文件名和路径字符串，循环内只做判断和收集任务
+    png_names = [f"page_{page_num:04d}.png" for page_num in selected_nums]
+    pdf_path_str = str(pdf_path)
+    jobs = []
+    needs_render = []
+    for page_num, png_name in zip(selected_nums, png_names):
+        output_path = str(output_dir / png_name)
+        if (not force_regenerate and cached_files.get(png_name) == cache_key
+                and os.path.exists(output_path)):
+            if verbose:
+                print(f"跳过已存在的文件: {output_path}")
+            needs_render.append(False)
             continue
-        pix.save(output_path)
-        print(f"✓ 已保存: {output_path}")
-        if inpaint:
-            inpaint_image(str(output_path), str(output_path), inpaint_method=inpaint_method)
-            print(f"✓ 已修复: {output_path}")
-
-        if make_wide_screen:
-            # 变为16:9宽屏图片
-            img = Image.open(output_path)
-            width, height = img.size
-            target_width = round(height * 16 / 9)
-            if target_width > width:
-                # 需要扩展宽度
-                new_img = Image.new("RGB", (target_width, height), (255, 255, 255))
-                new_img.paste(img, ((target_width - width) // 2, 0))
-                new_img.save(output_path)
-                print(f"✓ 已调整为宽屏: {output_path}")
-            elif target_width < width:
-                # 需要裁剪宽度
-                left = (width - target_width) // 2
-                right = left + target_width
-                cropped_img = img.crop((left, 0, right, height))
-                cropped_img.save(output_path)
-                print(f"✓ 已裁剪为宽屏: {output_path}")
-            else:
-                print(f"✓ 已是宽屏，无需调整: {output_path}")
-
-    pdf_doc.close()
+        # 即将重新渲染的页面先移出缓存记录，渲染结果被取用后再写回；
+        # 否则中途出错或提前停止时，已被覆盖的文件仍会挂在旧参数的缓存键下
+        cached_files.pop(png_name, None)
+        needs_render.append(True)
+        jobs.append((pdf_path_str, page_num, zoom, output_path, inpaint, inpaint_method, make_wide_screen, fast_png))
+
+    skipped = len(png_names) - len(jobs)
+    if skipped and not verbose:
+        print(f"跳过 {skipped} 个已存在的文件")
+
+    if progress_cb is None:
+        def progress_cb(done, total):
+            print(f"已生成 {done}/{total} 页")
+
+    def save_cache():
+        _save_png_cache(output_dir, {"key": cache_key, "page_count": page_count, "files": cached_files})
+
+    # 开始覆盖文件前先把移出待渲染页面的缓存写回磁盘，进程被强行终止时也不会留下过期记录
+    cache_dirty = bool(jobs) or cache.get("key") != cache_key
+    if cache_dirty:
+        save_cache()
+
+    total = len(jobs)
+    done = 0
+    last_emit = time.monotonic()
+    rendered = _run_render_jobs(jobs, max_workers=max_workers)
+    try:
+        # 渲染结果按任务顺序返回，与跳过的页面交错，按页码顺序产出
+        for png_name, render in zip(png_names, needs_render):
+            if render:
+                saved_path = next(rendered)
+                done += 1
+                cached_files[os.path.basename(saved_path)] = cache_key
+                if verbose:
+                    print(f"✓ 已保存: {saved_path}")
+                now = time.monotonic()
+                if done == total or now - last_emit >= PROGRESS_INTERVAL:
+                    last_emit = now
+                    progress_cb(done, total)
+                    # 随进度一并落盘已完成的页面
+                    save_cache()
+            yield png_name
+    finally:
+        # 即使中途出错或调用方提前停止，也记录已成功生成的页面
+        rendered.close()
+        if cache_dirty:
+            save_cache()
+
     print(f"\n完成! 共转换 {page_count} 页，输出目录: {output_dir}")
-    return png_names
 
 def pngs2pdf(png_files, output_pdf):
     """
@@ -101,15 +268,15 @@ def pngs2pdf(png_files, output_pdf):
         print("没有提供 PNG 文件列表，无法生成 PDF。")
         return
 
-    image_list = []
-    for png_file in png_files:
-        img = Image.open(png_file).convert("RGB")
-        image_list.append(img)
-
-    # 保存为 PDF
-    first_image = image_list[0]
-    rest_images = image_list[1:]
-    first_image.save(output_pdf, save_all=True, append_images=rest_images)
+    # 一次性构建 PDF 并只保存一次；PNG 数据直接嵌入，无需解码像素
+    with fitz.open() as pdf_doc:
+        for png_file in png_files:
+            # 只读取文件头获取尺寸，页面大小与 Pillow 默认的 72 DPI 一致
+            with Image.open(png_file) as img:
+                width, height = img.size
+            page = pdf_doc.new_page(width=width, height=height)
+            page.insert_image(page.rect, filename=str(png_file))
+        pdf_doc.save(output_pdf, deflate=True)
     print(f"✓ 已生成 PDF: {output_pdf}")
 
 if __name__ == "__main__":
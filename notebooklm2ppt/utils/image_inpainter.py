@@ -62,11 +62,14 @@ def get_method_name_from_id(method_id):
 
 
 def inpaint_image(image_path, output_path, inpaint_method='skimage'):
-    inpaint_method = get_method_id(inpaint_method)
-    
     image = Image.open(image_path)
-    image_defect = np.array(image)
-    
+    image_result = inpaint_array(np.array(image), inpaint_method=inpaint_method)
+    Image.fromarray(image_result).save(output_path)
+
+
+def inpaint_array(image_defect, inpaint_method='skimage'):
+    """修复 RGB 图像数组中的水印区域，返回修复后的数组（可能原地修改输入）"""
+    inpaint_method = get_method_id(inpaint_method)
     
     # [{\"width\":240,\"top\":1530,\"height\":65,\"left\":2620}]
     r1,r2,c1,c2 = 1536,1598,2627,2863
@@ -113,5 +116,5 @@ def inpaint_image(image_path, output_path, inpaint_method='skimage'):
     else:
         raise ValueError(f"Unknown inpaint method: {inpaint_method}")
 
+    return image_result
 
-    Image.fromarray(image_result).save(output_path)
@@ -1,11 +1,28 @@
 # 综合OCR和布局解析脚本
 import os
 import base64
+import mmap
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Optional
 
 
+# 请求超时（连接超时, 读取超时），单位秒；大文件解析耗时较长
+REQUEST_TIMEOUT = (5, 600)
+
+
+def encode_file(file_path: str) -> str:
+    """读取文件并进行 base64 编码（通过 mmap 读取，避免额外的整文件拷贝）"""
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return base64.b64encode(mapped).decode("ascii")
+
+
 class PP_OCR:
     """PDF OCR和布局解析处理器"""
     
@@ -38,20 +55,38 @@ class PP_OCR:
         }
     }
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, pretty_json: bool = False):
         """
         初始化OCR处理器
         
         参数：
             token: API访问令牌
+            pretty_json: 是否以缩进格式保存结果JSON（便于调试，默认紧凑格式）
         """
         self.token = token
+        self.pretty_json = pretty_json
         self.headers = {
             "Authorization": f"token {token}",
             "Content-Type": "application/json"
         }
+        # 复用连接（keep-alive），避免每次调用都重新进行 TCP/TLS 握手
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5),
+        ))
+    
+    def _dump_json(self, data, output_path: str) -> None:
+        """保存JSON结果，默认使用紧凑格式以减少序列化耗时和文件体积"""
+        with open(output_path, "w", encoding="utf-8") as json_file:
+            if self.pretty_json:
+                json.dump(data, json_file, ensure_ascii=False, indent=4)
+            else:
+                json.dump(data, json_file, ensure_ascii=False, separators=(",", ":"))
     
-    def process_pdf(self, file_path: str, api_type: str, output_path: str) -> Dict:
+    def process_pdf(self, file_path: str, api_type: str, output_path: str, file_data: Optional[str] = None) -> Dict:
         """
         处理PDF文件，调用指定的API
         
@@ -59,6 +94,7 @@ class PP_OCR:
             file_path: PDF文件路径
             api_type: 要调用的API类型，如 "PP-OCRv5", "PaddleOCR-VL-1.5", "PP-StructureV3"
             output_path: 输出文件路径
+            file_data: 已编码的 base64 文件内容（可选，多次调用同一文件时复用）
         
         返回：
             包含API调用结果的字典
@@ -75,9 +111,8 @@ class PP_OCR:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         # 读取和编码PDF文件
-        with open(file_path, "rb") as file:
-            file_bytes = file.read()
-            file_data = base64.b64encode(file_bytes).decode("ascii")
+        if file_data is None:
+            file_data = encode_file(file_path)
         
         config = self.API_CONFIG[api_type]
         
@@ -92,7 +127,7 @@ class PP_OCR:
             payload.update(config["params"])
             
             # 发送请求
-            response = requests.post(config["url"], json=payload, headers=self.headers)
+            response = self.session.post(config["url"], json=payload, timeout=REQUEST_TIMEOUT)
             
             if response.status_code != 200:
                 print(f"❌ {api_type} API 失败: HTTP {response.status_code}")
@@ -102,8 +137,7 @@ class PP_OCR:
             result = response.json().get("result")
             
             # 保存结果
-            with open(output_path, "w", encoding="utf-8") as json_file:
-                json.dump(result, json_file, ensure_ascii=False, indent=4)
+            self._dump_json(result, output_path)
             
             print(f"✓ {api_type} API 处理成功，结果已保存到: {output_path}")
             return {"status": "success", "output_file": output_path}
@@ -150,8 +184,7 @@ class PP_OCR:
             
         # 保存结果
         print(f"Saving merged result to {output_path}...")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(merged_result, f, ensure_ascii=False, indent=4)
+        self._dump_json(merged_result, output_path)
         
         print("Done!")
     
@@ -173,15 +206,24 @@ class PP_OCR:
             print(f"合并结果已存在，跳过处理: {merged_output}")
             return merged_output
         
-        # 调用 PaddleOCR-VL-1.5
-        result = self.process_pdf(file_path, "PaddleOCR-VL-1.5", vl_output)
-        if result.get("status") != "success":
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"文件不存在: {file_path}")
+        
+        # 两次调用使用同一文件，只编码一次
+        file_data = encode_file(file_path)
+        
+        # 两个 API 相互独立，同时调用 PaddleOCR-VL-1.5 和 PP-OCRv5
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_vl = executor.submit(self.process_pdf, file_path, "PaddleOCR-VL-1.5", vl_output, file_data)
+            future_v5 = executor.submit(self.process_pdf, file_path, "PP-OCRv5", v5_output, file_data)
+            result_vl = future_vl.result()
+            result_v5 = future_v5.result()
+        
+        if result_vl.get("status") != "success":
             print("PaddleOCR-VL-1.5 处理失败，跳过合并步骤")
             return None
         
-        # 调用 PP-OCRv5
-        result = self.process_pdf(file_path, "PP-OCRv5", v5_output)
-        if result.get("status") != "success":
+        if result_v5.get("status") != "success":
             print("PP-OCRv5 处理失败，跳过合并步骤")
             return None
         
@@ -1,17 +1,29 @@
 """从 PaddleOCR (PP-Structure) JSON 直接创建 PPT"""
 
+import io
 import os
+import functools
 import json
 import argparse
-import copy
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import numpy as np
 from PIL import Image
-from notebooklm2ppt.pdf2png import pdf_to_png
-from notebooklm2ppt.utils.ppt_combiner import clean_ppt
+from notebooklm2ppt.pdf2png import iter_pdf_to_png, resolve_max_workers, FAST_PNG_OPTIONS
 from notebooklm2ppt.utils.edge_diversity import compute_edge_diversity_numpy
-from spire.presentation import *
-from spire.presentation.common import *
+
+# Spire.Presentation 初始化开销较大，仅在实际创建 PPT 的函数内按需导入
+
+# 转换为文本框的版面标签
+TEXT_LABELS = frozenset({
+    'text', 'title', 'header', 'footer', 'reference', 'paragraph_title',
+    'algorithm'
+})
+# 作为独立图片提取的前景标签
+FOREGROUND_LABELS = frozenset({'image', 'table', 'chart'})
+# 需要从背景中擦除的标签（已转换为文本框或独立图片）
+ERASABLE_LABELS = TEXT_LABELS | FOREGROUND_LABELS
 
 # ============================================================================
 # 文本分析工具函数
@@ -46,43 +58,53 @@ def calculate_font_size(height,
     return font_size
 
 
-def get_line_count(block_bbox, ocr_boxes):
+def get_ocr_box_geometry(ocr_boxes):
+    """
+    将 OCR 文本框一次性转换为中心点和高度数组，供同一页的多个文本块复用
+    
+    Args:
+        ocr_boxes: OCR识别的所有文本框列表
+        
+    Returns:
+        tuple: (中心点x数组, 中心点y数组, 高度数组)
+    """
+    boxes = np.asarray(ocr_boxes, dtype=np.float64).reshape(-1, 4)
+    cx = (boxes[:, 0] + boxes[:, 2]) / 2
+    cy = (boxes[:, 1] + boxes[:, 3]) / 2
+    heights = boxes[:, 3] - boxes[:, 1]
+    return cx, cy, heights
+
+
+def get_line_count(block_bbox, ocr_geometry):
     """
     计算文本块内的实际行数
     
     Args:
         block_bbox: 文本块边界框 [x1, y1, x2, y2]
-        ocr_boxes: OCR识别的所有文本框列表
+        ocr_geometry: get_ocr_box_geometry 返回的 OCR 框几何信息
         
     Returns:
         int: 文本块内的行数
     """
     bx1, by1, bx2, by2 = block_bbox
+    cx, cy, heights = ocr_geometry
 
     # 筛选出该 block 范围内的 OCR 框 (使用中心点判定)
-    contained_boxes = []
-    for obox in ocr_boxes:
-        ox1, oy1, ox2, oy2 = obox
-        cx = (ox1 + ox2) / 2
-        cy = (oy1 + oy2) / 2
-
-        if bx1 <= cx <= bx2 and by1 <= cy <= by2:
-            contained_boxes.append(obox)
-
-    if not contained_boxes:
+    mask = (cx >= bx1) & (cx <= bx2) & (cy >= by1) & (cy <= by2)
+    if not mask.any():
         return 0
 
     # 按 y 中心点排序并进行简单的聚类分析行数
-    contained_boxes.sort(key=lambda b: (b[1] + b[3]) / 2)
+    contained_cy = cy[mask]
+    order = np.argsort(contained_cy, kind='stable')
+    y_centers = contained_cy[order].tolist()
+    box_heights = heights[mask][order].tolist()
 
     line_count = 1
-    last_y_center = (contained_boxes[0][1] + contained_boxes[0][3]) / 2
-    last_h = contained_boxes[0][3] - contained_boxes[0][1]
-
-    for j in range(1, len(contained_boxes)):
-        curr_y_center = (contained_boxes[j][1] + contained_boxes[j][3]) / 2
-        curr_h = contained_boxes[j][3] - contained_boxes[j][1]
+    last_y_center = y_centers[0]
+    last_h = box_heights[0]
 
+    for curr_y_center, curr_h in zip(y_centers[1:], box_heights[1:]):
         # 阈值：如果垂直间距超过行高的 60%，判定为新行
         if abs(curr_y_center - last_y_center) > max(last_h, curr_h) * 0.6:
             line_count += 1
@@ -108,6 +130,9 @@ def setup_presentation(pdf_size):
     Returns:
         tuple: (presentation对象, ppt_width, ppt_height, scale缩放比例)
     """
+    from spire.presentation import Presentation, SlideSizeType
+    from spire.presentation.common import SizeF
+
     presentation = Presentation()
     if presentation.Slides.Count > 0:
         presentation.Slides.RemoveAt(0)
@@ -158,11 +183,7 @@ def should_skip_text_block(label, content):
         bool: True表示跳过，False表示处理
     """
     # 只处理特定类型的文本标签
-    valid_labels = [
-        'text', 'title', 'header', 'footer', 'reference', 'paragraph_title',
-        'algorithm'
-    ]
-    if label not in valid_labels:
+    if label not in TEXT_LABELS:
         return True
 
     # 跳过页脚中的水印信息
@@ -176,6 +197,20 @@ def should_skip_text_block(label, content):
     return False
 
 
+@functools.lru_cache(maxsize=8)
+def _get_font(font_name):
+    """按字体名缓存 TextFont 对象，避免为每个文本段重复创建"""
+    from spire.presentation import TextFont
+    return TextFont(font_name)
+
+
+@functools.lru_cache(maxsize=1)
+def _black_color():
+    """缓存黑色 Color 对象（Spire 按需导入，因此不能在模块加载时创建）"""
+    from spire.presentation.common import Color
+    return Color.FromArgb(255, 0, 0, 0)
+
+
 def create_text_shape(slide,
                       content,
                       label,
@@ -185,7 +220,8 @@ def create_text_shape(slide,
                       ppt_height,
                       font_size,
                       font_name,
-                      delta_y=2):
+                      delta_y=2,
+                      verbose=False):
     """
     在幻灯片上创建文本形状
     
@@ -200,23 +236,30 @@ def create_text_shape(slide,
         font_size: 字体大小
         font_name: 字体名称
         delta_y: Y轴偏移量
+        verbose: 是否打印标题内容
         
     Returns:
         文本形状对象
     """
+    from spire.presentation import TextAlignmentType, ShapeType, FillFormatType
+    from spire.presentation.common import RectangleF
+
     bx1, by1, bx2, by2 = bbox
 
-    # 坐标转换 (应用对齐偏移量 delta_y)
-    left = bx1 * scale
-    top = by1 * scale + delta_y
-    right = bx2 * scale
-    bottom = by2 * scale + delta_y
-    width = right - left
-    height = bottom - top
+    # 坐标转换 (应用对齐偏移量 delta_y)；resize_data 之后 scale 恒为 1，无需缩放
+    if scale == 1.0:
+        left, right = bx1, bx2
+        top, bottom = by1 + delta_y, by2 + delta_y
+    else:
+        left = bx1 * scale
+        top = by1 * scale + delta_y
+        right = bx2 * scale
+        bottom = by2 * scale + delta_y
 
 
     if label =='paragraph_title':
-        print(content)
+        if verbose:
+            print(content)
         alignment = TextAlignmentType.Left
         h_padding = 5
         v_padding = 5
@@ -247,13 +290,15 @@ def create_text_shape(slide,
     text_shape.Fill.FillType = FillFormatType.none
     
     # 设置文本格式
+    font = _get_font(font_name)
+    black = _black_color()
     for paragraph in text_shape.TextFrame.Paragraphs:
         paragraph.Alignment = alignment
         for text_range in paragraph.TextRanges:
-            text_range.LatinFont = TextFont(font_name)
+            text_range.LatinFont = font
             text_range.FontHeight = font_size
             text_range.Fill.FillType = FillFormatType.Solid
-            text_range.Fill.SolidColor.Color = Color.FromArgb(255, 0, 0, 0)
+            text_range.Fill.SolidColor.Color = black
 
     return text_shape
 
@@ -264,7 +309,8 @@ def process_text_blocks(slide,
                         scale,
                         ppt_width,
                         ppt_height,
-                        font_name="Calibri"):
+                        font_name="Calibri",
+                        verbose=False):
     """
     处理页面上的所有文本块
     
@@ -276,7 +322,10 @@ def process_text_blocks(slide,
         ppt_width: PPT宽度
         ppt_height: PPT高度
         font_name: 字体名称
+        verbose: 是否打印每个文本块的详细信息
     """
+    ocr_geometry = get_ocr_box_geometry(ocr_boxes)
+
     for item in parsing_res_list:
         label = item.get('block_label', 'unknown')
         content = item.get('block_content', '')
@@ -290,12 +339,12 @@ def process_text_blocks(slide,
             continue
 
         # 计算行数和字体大小
-        line_count = get_line_count(bbox, ocr_boxes)
+        line_count = get_line_count(bbox, ocr_geometry)
         is_multiline = line_count > 1
 
-        bx1, by1, bx2, by2 = bbox
-        width = (bx2 - bx1) * scale
-        height = (by2 - by1) * scale
+        height = bbox[3] - bbox[1]
+        if scale != 1.0:
+            height *= scale
 
         font_size = calculate_font_size(height,
                                         is_multiline=is_multiline,
@@ -303,7 +352,7 @@ def process_text_blocks(slide,
 
         # 创建文本形状
         create_text_shape(slide, content, label, bbox, scale, ppt_width,
-                          ppt_height, font_size, font_name)
+                          ppt_height, font_size, font_name, verbose=verbose)
 
 
 # ============================================================================
@@ -311,116 +360,112 @@ def process_text_blocks(slide,
 # ============================================================================
 
 
-def expand_bbox(bbox, expand_px, size):
+def crop_foreground_element(page_img, img_box, label, index, png_dir,
+                            page_idx, verbose=False):
     """
-    扩展边界框
+    裁剪前景元素(图片、表格、图表)并保存为 PNG，不涉及 PPT 对象，可在子进程中执行
     
     Args:
-        bbox: 边界框 [x1, y1, x2, y2]
-        expand_px: 扩展像素数
-        img_width: 图片宽度
-        img_height: 图片高度
+        page_img: 页面图片 (PIL.Image)，需在擦除前的原图上裁剪
+        img_box: 已扩展并缩放到图片坐标的整数边界框 [l, t, r, b]
+        label: 元素标签
+        index: 元素索引
+        png_dir: PNG输出目录
+        page_idx: 页面索引
+        verbose: 是否打印跳过信息
         
     Returns:
-        list: 扩展后的边界框
+        str: 裁剪图路径，裁剪区域无效返回 None
     """
-    width, height = size
-    x1, y1, x2, y2 = bbox
-    x1 = max(0, x1 - expand_px)
-    y1 = max(0, y1 - expand_px)
-    x2 = min(width, x2 + expand_px)
-    y2 = min(height, y2 + expand_px)
-    return [x1, y1, x2, y2]
+    # PIL 裁剪越界部分会补黑边，先限制在图片范围内（与数组切片行为一致）
+    image_w, image_h = page_img.size
+    l_img, t_img, r_img, b_img = img_box
+    r_img = min(r_img, image_w)
+    b_img = min(b_img, image_h)
 
+    if r_img <= l_img or b_img <= t_img:
+        if verbose:
+            print("裁剪区域无效，跳过")
+        return None
+
+    # 直接在已解码的 PIL 图片上裁剪并保存，无需每个元素再从数组构造图片
+    crop_name = f"page_{page_idx+1}_{label}_{index}.png"
+    crop_path = png_dir / crop_name
+    page_img.crop((l_img, t_img, r_img, b_img)).save(crop_path, **FAST_PNG_OPTIONS)
+    return str(crop_path)
 
-def scale_bbox(bbox, s, make_int=True):
+
+def expand_bboxes(bboxes, expand_px, size):
     """
-    按比例缩放并四舍五入边界框坐标
+    批量扩展边界框（左上减、右下加 expand_px，并限制在边界尺寸内）
     
     Args:
-        bbox: 边界框 [x1, y1, x2, y2]
-        scale: 缩放比例
+        bboxes: 边界框列表 [[x1, y1, x2, y2], ...]
+        expand_px: 扩展像素数
+        size: 边界尺寸 (宽, 高)
         
     Returns:
-        list: 缩放并四舍五入后的边界框
+        np.ndarray: 扩展后的 (N, 4) 浮点边界框数组
     """
-    if make_int:
-        l, t, r, b = bbox
-        # 左上向下取整，右下向上取整
-        return [int(l * s), int(t * s), int(np.ceil(r * s)), int(np.ceil(b * s))]
-    else:
-        return [coord * s for coord in bbox]
+    width, height = size
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+    boxes[:, :2] = np.maximum(0, boxes[:, :2] - expand_px)
+    boxes[:, 2:] = np.minimum((width, height), boxes[:, 2:] + expand_px)
+    return boxes
 
 
-def extract_foreground_element(slide, item, index, image_cv, img_scale, scale,
-                               pdf_size, png_dir, page_idx):
+def bboxes_to_array(bboxes, *operands):
     """
-    提取前景元素(图片、表格、图表)并添加到幻灯片
+    将边界框列表转换为 (N, 4) 数组，整数坐标保持整数类型
     
     Args:
-        slide: 幻灯片对象
-        item: 元素信息
-        index: 元素索引
-        image_cv: 图片数组
-        img_scale: 图片缩放比例
-        scale: PPT缩放比例
-        png_dir: PNG输出目录
-        page_idx: 页面索引
+        bboxes: 边界框列表 [[x1, y1, x2, y2], ...]
+        *operands: 之后要参与原地运算的标量（如偏移量、裁剪边界），
+                   其中有浮点数时数组提升为浮点类型，避免原地运算报错或截断
         
     Returns:
-        bool: 是否成功提取
+        np.ndarray: 边界框数组
     """
-    label = item.get('block_label')
-    bbox = item.get('block_bbox')
-
-    if not bbox:
-        return False
-
-    expanded_bbox = expand_bbox(bbox, expand_px=2, size=pdf_size)
-
-    # 原始图上的坐标用于裁剪 (对齐偏移量)
-    l_img, t_img, r_img, b_img = scale_bbox(expanded_bbox, img_scale)
-
-    if r_img <= l_img or b_img <= t_img:
-        print("裁剪区域无效，跳过")
-        return False
-
-    # 裁剪并保存
-    crop = image_cv[t_img:b_img, l_img:r_img]
-    crop_name = f"page_{page_idx+1}_{label}_{index}.png"
-    crop_path = png_dir / crop_name
-    Image.fromarray(crop).save(crop_path)
+    boxes = np.asarray([bbox[:4] for bbox in bboxes]).reshape(-1, 4)
+    return boxes.astype(np.result_type(boxes, *operands), copy=False)
 
-    # 添加到幻灯片
-    l_ppt, t_ppt, r_ppt, b_ppt = scale_bbox(expanded_bbox, scale, make_int=False)
-    rect_item = RectangleF.FromLTRB(l_ppt, t_ppt, r_ppt, b_ppt)
 
-    img_shape = slide.Shapes.AppendEmbedImageByPath(ShapeType.Rectangle,
-                                                    str(crop_path), rect_item)
-    img_shape.Line.FillType = FillFormatType.none
-    img_shape.ZOrderPosition = 0  # 设为底层形状
-
-    return True
+def scale_bboxes(boxes, s):
+    """
+    批量缩放边界框并取整（左上向下取整，右下向上取整）
+    
+    Args:
+        boxes: (N, 4) 边界框数组
+        s: 缩放比例
+        
+    Returns:
+        np.ndarray: 缩放后的整数边界框数组
+    """
+    boxes = np.asarray(boxes, dtype=np.float64) * s
+    # 左上向下取整，右下向上取整
+    scaled = np.empty(boxes.shape, dtype=np.int64)
+    scaled[:, :2] = boxes[:, :2]
+    scaled[:, 2:] = np.ceil(boxes[:, 2:])
+    return scaled
 
 
-def erase_region(image_cv, bbox, img_scale, pdf_size):
+def erase_region(image_cv, box, verbose=False):
     """
     擦除图片中的指定区域
     
     Args:
         image_cv: 图片数组
-        bbox: 边界框
-        img_scale: 缩放比例
-        pdf_size: PDF尺寸 (宽, 高)
+        box: 已扩展并缩放到图片坐标的整数边界框 [l, t, r, b]
+        verbose: 是否打印跳过信息
         
     Returns:
         bool: 是否成功擦除
     """
-    expanded_bbox = expand_bbox(bbox, expand_px=2, size=pdf_size)
-    l, t, r, b = scale_bbox(expanded_bbox, img_scale, make_int=True)
+    l, t, r, b = box
 
     if r <= l or b <= t:
-        print("擦除区域无效，跳过")
+        if verbose:
+            print("擦除区域无效，跳过")
         return False
 
     # 计算填充颜色并擦除
@@ -435,68 +480,153 @@ def erase_region(image_cv, bbox, img_scale, pdf_size):
     return True
 
 
-def process_slide_background(slide, presentation, parsing_res_list, png_file,
-                             pdf_size, scale, png_dir, page_idx):
+def resample_filter_for(src_size, dst_size):
     """
-    处理幻灯片背景（提取前景元素、擦除已处理区域、设置背景）
+    根据缩放方向选择重采样滤镜
+    
+    Args:
+        src_size: 原始尺寸 (宽, 高)
+        dst_size: 目标尺寸 (宽, 高)
+        
+    Returns:
+        int: 缩小用 BOX（区域平均，速度快且无混叠），放大用 LANCZOS
+    """
+    if dst_size[0] <= src_size[0] and dst_size[1] <= src_size[1]:
+        return Image.BOX
+    return Image.LANCZOS
+
+
+def prepare_slide_background(parsing_res_list, png_file, pdf_size, scale,
+                             png_dir, page_idx, debug=False, verbose=False):
+    """
+    幻灯片背景的图像处理部分（提取前景元素、擦除已处理区域、保存背景图）
+    
+    只使用 NumPy/PIL，不涉及 PPT 对象，可在子进程中并行执行
     
     Args:
-        slide: 幻灯片对象
-        presentation: 演示文稿对象
         parsing_res_list: 解析结果列表
         png_file: PNG文件路径
         pdf_size: PDF尺寸 (宽, 高)
         scale: 缩放比例
         png_dir: PNG输出目录
         page_idx: 页面索引
+        debug: 是否额外将处理后的背景图保存到磁盘
+        verbose: 是否打印每个元素的详细信息
+        
+    Returns:
+        dict: {'crops': [(裁剪图路径, PPT位置), ...], 'background': 背景图 PNG 字节}，
+              PNG 不存在时返回 None
     """
     if not png_file.exists():
-        return
+        return None
 
     # 加载图片
     pdf_w, pdf_h = pdf_size
     img = Image.open(png_file)
-    img = img.resize(pdf_size, Image.LANCZOS)
+    if img.size != tuple(pdf_size):
+        img = img.resize(pdf_size, resample_filter_for(img.size, pdf_size))
     image_cv = np.array(img)
     image_h, image_w = image_cv.shape[:2]
-    img_scale = image_w / pdf_w
-    ppt2img_scale = scale / img_scale
+    # 尺寸一致时无需计算缩放比例
+    img_scale = 1.0 if image_w == pdf_w else image_w / pdf_w
 
-    # 1. 提取前景图 (图片、表格、图表)
+    # 一次遍历完成分类：前景元素待裁剪，已转换为文本框或独立图片的区域待擦除
+    # （前景标签是可擦除标签的子集）
+    blocks = []
     for i, item in enumerate(parsing_res_list):
         label = item.get('block_label')
-        if label in ['image', 'table', 'chart']:
-            extract_foreground_element(slide, item, i, image_cv, img_scale,
-                                       scale, pdf_size, png_dir, page_idx)
-
-    # 2. 擦除已转换为文本框或独立图片的区域
-    erasable_labels = [
-        'text', 'title', 'header', 'footer', 'reference', 'paragraph_title',
-        'image', 'table', 'algorithm', 'chart'
-    ]
+        bbox = item.get('block_bbox')
+        if bbox and label in ERASABLE_LABELS:
+            blocks.append((i, label, bbox))
+
+    crops = []
+    if blocks:
+        # 每个元素的扩展框只计算一次，同时得到图片坐标和PPT坐标
+        expanded = expand_bboxes([bbox for _, _, bbox in blocks], 2, pdf_size)
+        img_boxes = scale_bboxes(expanded, img_scale).tolist()
+        ppt_rects = (expanded if scale == 1.0 else expanded * scale).tolist()
+
+        # 1. 提取前景图 (图片、表格、图表)；必须在任何擦除之前裁剪，
+        # 否则与其重叠的文本块会先被擦掉
+        for (i, label, _), img_box, ppt_rect in zip(blocks, img_boxes, ppt_rects):
+            if label in FOREGROUND_LABELS:
+                crop_path = crop_foreground_element(img, img_box, label, i,
+                                                    png_dir, page_idx, verbose)
+                if crop_path:
+                    crops.append((crop_path, ppt_rect))
+
+        # 2. 擦除已转换为文本框或独立图片的区域
+        for img_box in img_boxes:
+            erase_region(image_cv, img_box, verbose)
+
+    # 3. 在内存中编码处理后的图片，直接嵌入 PPT，无需落盘再读回
+    buffer = io.BytesIO()
+    Image.fromarray(image_cv).save(buffer, format="PNG", **FAST_PNG_OPTIONS)
+    background_bytes = buffer.getvalue()
+    if debug:
+        processed_png = png_dir / f"page_{page_idx+1}_paddle_processed.png"
+        processed_png.write_bytes(background_bytes)
+
+    return {'crops': crops, 'background': background_bytes}
+
+
+def apply_slide_background(slide, presentation, background):
+    """
+    将 prepare_slide_background 的结果写入幻灯片（需在主线程中执行）
+    
+    Args:
+        slide: 幻灯片对象
+        presentation: 演示文稿对象
+        background: prepare_slide_background 的返回值
+    """
+    from spire.presentation import BackgroundType, ShapeType, FillFormatType, PictureFillType
+    from spire.presentation.common import RectangleF, Stream
 
-    for item in parsing_res_list:
-        label = item.get('block_label')
-        if label in erasable_labels:
-            bbox = item.get('block_bbox')
-            if bbox:
-                erase_region(image_cv, bbox, img_scale, pdf_size)
-                
+    if not background:
+        return
 
-    # 3. 保存处理后的图片
-    processed_png = png_dir / f"page_{page_idx+1}_paddle_processed.png"
-    Image.fromarray(image_cv).save(processed_png)
+    # 1. 添加前景图
+    for crop_path, (l_ppt, t_ppt, r_ppt, b_ppt) in background['crops']:
+        rect_item = RectangleF.FromLTRB(l_ppt, t_ppt, r_ppt, b_ppt)
+        img_shape = slide.Shapes.AppendEmbedImageByPath(ShapeType.Rectangle,
+                                                        crop_path, rect_item)
+        img_shape.Line.FillType = FillFormatType.none
+        img_shape.ZOrderPosition = 0  # 设为底层形状
 
-    # 4. 设置幻灯片背景
+    # 2. 设置幻灯片背景
     slide.SlideBackground.Type = BackgroundType.Custom
     slide.SlideBackground.Fill.FillType = FillFormatType.Picture
 
-    stream = Stream(str(processed_png))
+    stream = Stream(background['background'])
     image_data = presentation.Images.AppendStream(stream)
     slide.SlideBackground.Fill.PictureFill.Picture.EmbedImage = image_data
     slide.SlideBackground.Fill.PictureFill.FillType = PictureFillType.Stretch
 
 
+def _run_background_jobs(jobs, max_workers=None):
+    """
+    按页序依次产出背景处理结果，使用进程池并行处理各页
+    
+    jobs 可以是惰性迭代器（例如边渲染边产出的 PNG），取到一个任务就立即提交，
+    队首页面完成后尽早交回，使 PDF 渲染与背景处理形成流水线
+    """
+    max_workers = resolve_max_workers(max_workers)
+    if max_workers == 1:
+        for job in jobs:
+            yield prepare_slide_background(*job)
+        return
+    # 各页的解码、缩放、擦除、编码相互独立且为 CPU 密集型，按页并行；
+    # Spire 对象只能在主线程操作，因此结果按页序交回主线程写入幻灯片
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for job in jobs:
+            pending.append(executor.submit(prepare_slide_background, *job))
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 def get_pdf_size_from_data(data):
     """
     从布局结果中获取PDF尺寸
@@ -532,22 +662,18 @@ def update_data_size(data, width, height=None):
     
     # 更新布局结果中的宽高
     for page_layout in layout_results:
-        pruned_result = page_layout.get('prunedResult', {})
+        pruned_result = page_layout['prunedResult']
         pruned_result['width'] = width
         if height is not None:
             pruned_result['height'] = height
     
-    # 更新dataInfo中的宽高
-    data_info = data.get('dataInfo', {})
+    # 更新dataInfo及其pages中的宽高
+    data_info = data.get('dataInfo')
     if data_info:
         data_info['width'] = width
         if height is not None:
             data_info['height'] = height
-    
-    # 更新pages中的宽高
-    pages_info = data_info.get('pages', [])
-    if pages_info:
-        for page in pages_info:
+        for page in data_info.get('pages', ()):
             page['width'] = width
             if height is not None:
                 page['height'] = height
@@ -556,7 +682,7 @@ def update_data_size(data, width, height=None):
 
 def make_data_wide_screen(data):
     """
-    将数据调整为16:9宽屏比例
+    将数据调整为16:9宽屏比例（原地修改传入的数据）
     
     Args:
         data: PaddleOCR JSON数据
@@ -564,8 +690,6 @@ def make_data_wide_screen(data):
     Returns:
         dict: 调整后的数据
     """
-    data = copy.deepcopy(data)
-    
     # 获取原始PDF尺寸
     layout_results = data.get('layoutParsingResults', [])
     if not layout_results:
@@ -589,29 +713,28 @@ def make_data_wide_screen(data):
         print(f"✓ 扩展宽度: {pdf_w} -> {target_width} (左右各偏移 {offset_x})")
         
         # 设置新的宽度
-        data = update_data_size(data, target_width)
-        layout_results = data.get('layoutParsingResults', [])
+        update_data_size(data, target_width)
         for page_layout in layout_results:
-            pruned_result = page_layout.get('prunedResult', {})
-            parsing_res_list = pruned_result.get('parsing_res_list', [])
-            for item in parsing_res_list:
-                bbox = item.get('block_bbox')
-                if bbox:
-                    # 横坐标右移
-                    item['block_bbox'] = [bbox[0] + offset_x, bbox[1], 
-                                            bbox[2] + offset_x, bbox[3]]
+            parsing_res_list = page_layout['prunedResult'].get('parsing_res_list', ())
+            items = [item for item in parsing_res_list if item.get('block_bbox')]
+            if items:
+                # 横坐标右移
+                boxes = bboxes_to_array([item['block_bbox'] for item in items], offset_x)
+                boxes[:, [0, 2]] += offset_x
+                for item, row in zip(items, boxes.tolist()):
+                    item['block_bbox'] = row
         
         # 调整OCR结果
         ocr_results = data.get('ocrResults', [])
         for page_ocr in ocr_results:
-            pruned_result = page_ocr.get('prunedResult', {})
-            rec_boxes = pruned_result.get('rec_boxes', [])
-            
-            for bbox in rec_boxes:
-                if bbox and len(bbox) >= 4:
-                    # 横坐标右移
-                    bbox[0] += offset_x
-                    bbox[2] += offset_x
+            rec_boxes = [bbox for bbox in page_ocr['prunedResult'].get('rec_boxes', ())
+                         if bbox and len(bbox) >= 4]
+            if rec_boxes:
+                # 横坐标右移
+                boxes = bboxes_to_array(rec_boxes, offset_x)
+                boxes[:, [0, 2]] += offset_x
+                for bbox, row in zip(rec_boxes, boxes.tolist()):
+                    bbox[:4] = row
     
     elif target_width < pdf_w:
         # 需要裁剪宽度 - 计算左边界
@@ -621,27 +744,20 @@ def make_data_wide_screen(data):
         print(f"✓ 裁剪宽度: {pdf_w} -> {target_width} (保留中间部分 {left}-{right})")
         
         # 设置新的宽度
-        data = update_data_size(data, target_width)
-        layout_results = data.get('layoutParsingResults', [])
+        update_data_size(data, target_width)
         
         # 调整所有坐标并过滤超出范围的元素
         for page_layout in layout_results:
-            pruned_result = page_layout.get('prunedResult', {})
-            pruned_result['width'] = target_width
-            
-            parsing_res_list = pruned_result.get('parsing_res_list', [])
+            pruned_result = page_layout['prunedResult']
+            parsing_res_list = pruned_result.get('parsing_res_list', ())
+            items = [item for item in parsing_res_list if item.get('block_bbox')]
             filtered_list = []
-            
-            for item in parsing_res_list:
-                bbox = item.get('block_bbox')
-                if bbox:
-                    x1, y1, x2, y2 = bbox
-                    # 检查是否在裁剪范围内
-                    if x2 > left and x1 < right:
-                        # 调整坐标并裁剪到边界
-                        new_x1 = max(0, x1 - left)
-                        new_x2 = min(target_width, x2 - left)
-                        item['block_bbox'] = [new_x1, y1, new_x2, y2]
+            if items:
+                boxes = bboxes_to_array([item['block_bbox'] for item in items], left, target_width)
+                keep = crop_bboxes_x(boxes, left, right, target_width)
+                for item, row, inside in zip(items, boxes.tolist(), keep.tolist()):
+                    if inside:
+                        item['block_bbox'] = row
                         filtered_list.append(item)
             
             pruned_result['parsing_res_list'] = filtered_list
@@ -649,18 +765,17 @@ def make_data_wide_screen(data):
         # 调整OCR结果
         ocr_results = data.get('ocrResults', [])
         for page_ocr in ocr_results:
-            pruned_result = page_ocr.get('prunedResult', {})
-            rec_boxes = pruned_result.get('rec_boxes', [])
+            pruned_result = page_ocr['prunedResult']
+            rec_boxes = [bbox for bbox in pruned_result.get('rec_boxes', ())
+                         if bbox and len(bbox) >= 4]
             
             filtered_boxes = []
-            for bbox in rec_boxes:
-                if bbox and len(bbox) >= 4:
-                    x1, y1, x2, y2 = bbox[0], bbox[1], bbox[2], bbox[3]
-                    # 检查是否在裁剪范围内
-                    if x2 > left and x1 < right:
-                        # 调整坐标
-                        bbox[0] = max(0, x1 - left)
-                        bbox[2] = min(target_width, x2 - left)
+            if rec_boxes:
+                boxes = bboxes_to_array(rec_boxes, left, target_width)
+                keep = crop_bboxes_x(boxes, left, right, target_width)
+                for bbox, row, inside in zip(rec_boxes, boxes.tolist(), keep.tolist()):
+                    if inside:
+                        bbox[:4] = row
                         filtered_boxes.append(bbox)
             
             pruned_result['rec_boxes'] = filtered_boxes
@@ -668,10 +783,30 @@ def make_data_wide_screen(data):
     return data
 
 
+def crop_bboxes_x(boxes, left, right, target_width):
+    """
+    按裁剪窗口 [left, right) 平移并截断边界框横坐标（原地修改数组）
+    
+    Args:
+        boxes: (N, 4) 边界框数组
+        left: 裁剪左边界
+        right: 裁剪右边界
+        target_width: 裁剪后的宽度
+        
+    Returns:
+        np.ndarray: 布尔掩码，True 表示该框与裁剪范围有交集
+    """
+    # 检查是否在裁剪范围内
+    keep = (boxes[:, 2] > left) & (boxes[:, 0] < right)
+    # 调整坐标并裁剪到边界
+    boxes[:, 0] = np.maximum(0, boxes[:, 0] - left)
+    boxes[:, 2] = np.minimum(target_width, boxes[:, 2] - left)
+    return keep
+
 
 def resize_data(data, pdf_size, ppt_size):
     """
-    调整数据中的坐标以适应PPT尺寸
+    调整数据中的坐标以适应PPT尺寸（原地修改传入的数据）
     
     Args:
         data: PaddleOCR JSON数据
@@ -690,35 +825,32 @@ def resize_data(data, pdf_size, ppt_size):
 
     assert abs(scale_x - scale_y) < 1e-2, "X和Y缩放比例不一致"
     scale = scale_x
-    data = copy.deepcopy(data)
     
     # 同步更新页面尺寸信息
-    data = update_data_size(data, ppt_w, ppt_h)
+    update_data_size(data, ppt_w, ppt_h)
     
     layout_results = data.get('layoutParsingResults', [])
     ocr_results = data.get('ocrResults', [])
     
     # 调整布局结果中的坐标
     for page_layout in layout_results:
-        pruned_result = page_layout.get('prunedResult', {})
-        parsing_res_list = pruned_result.get('parsing_res_list', [])
-        
-        for item in parsing_res_list:
-            bbox = item.get('block_bbox')
-            if bbox:
-                # 调整边界框坐标
-                item['block_bbox'] = scale_bbox(bbox, scale, make_int=True)
+        parsing_res_list = page_layout['prunedResult'].get('parsing_res_list', ())
+        items = [item for item in parsing_res_list if item.get('block_bbox')]
+        if items:
+            # 调整边界框坐标
+            boxes = scale_bboxes(bboxes_to_array([item['block_bbox'] for item in items]), scale)
+            for item, row in zip(items, boxes.tolist()):
+                item['block_bbox'] = row
     
     # 调整OCR结果中的坐标
     for page_ocr in ocr_results:
-        pruned_result = page_ocr.get('prunedResult', {})
-        rec_boxes = pruned_result.get('rec_boxes', [])
-        
-        for bbox in rec_boxes:
-            if bbox and len(bbox) >= 4:
-                # 调整OCR框坐标
-                new_bbox = scale_bbox(bbox, scale, make_int=True)
-                bbox[0], bbox[1], bbox[2], bbox[3] = new_bbox
+        rec_boxes = [bbox for bbox in page_ocr['prunedResult'].get('rec_boxes', ())
+                     if bbox and len(bbox) >= 4]
+        if rec_boxes:
+            # 调整OCR框坐标
+            boxes = scale_bboxes(bboxes_to_array(rec_boxes), scale)
+            for bbox, row in zip(rec_boxes, boxes.tolist()):
+                bbox[:4] = row
     
     return data
 
@@ -735,7 +867,10 @@ def create_ppt_from_paddle_json(json_file,
                                 out_ppt_name=None,
                                 dpi=150,
                                 inpaint=True,
-                                inpaint_method='background_smooth'):
+                                inpaint_method='background_smooth',
+                                max_workers=None,
+                                debug=False,
+                                verbose=False):
     """
     从 PaddleOCR JSON 直接创建 PPT
     
@@ -747,7 +882,14 @@ def create_ppt_from_paddle_json(json_file,
         dpi: 图片清晰度
         inpaint: 是否进行图像修复
         inpaint_method: 图像修复方法
+        max_workers: PDF 渲染与背景图像处理合计的并行进程数，默认使用 CPU 核心数
+        debug: 是否保存处理后的背景图，便于排查擦除效果
+        verbose: 是否打印每个文本块和元素的详细信息
     """
+    from spire.presentation import FileFormat
+    # ppt_combiner 在模块级导入 Spire，同样按需导入，避免后台子进程初始化 Spire
+    from notebooklm2ppt.utils.ppt_combiner import clean_ppt
+
     # 验证输入文件
     if not os.path.exists(json_file):
         print(f"错误: JSON 文件 {json_file} 不存在")
@@ -765,18 +907,22 @@ def create_ppt_from_paddle_json(json_file,
 
     # 步骤 1: 将 PDF 转换为 PNG
     print("=" * 60)
-    print("步骤 1: 将 PDF 转换为 PNG 图片")
+    print("步骤 1: 将 PDF 转换为 PNG 图片（与步骤 3 的逐页处理流水线进行）")
     print("=" * 60)
-    png_names = pdf_to_png(pdf_file,
-                           png_dir,
-                           dpi=dpi,
-                           inpaint=inpaint,
-                           inpaint_method=inpaint_method,
-                           force_regenerate=True, 
-                           make_wide_screen=True)
-    # 重新利用生成的 PNG 文件列表，生成PDF
-    
-    png_files = [png_dir / name for name in png_names]
+    # 渲染与背景处理两个进程池同时运行，按总进程数对半分配，避免进程数超过 CPU 核心数；
+    # 两个进程池各自经 resolve_max_workers 限制在 Windows 的上限之内
+    total_workers = max_workers or os.cpu_count() or 1
+    render_workers = max(1, total_workers // 2)
+    background_workers = max(1, total_workers - render_workers)
+    # 惰性产出：每页 PNG 写完即可开始该页的背景处理，无需等待整份 PDF 渲染完毕
+    png_stream = iter_pdf_to_png(pdf_file,
+                                 png_dir,
+                                 dpi=dpi,
+                                 inpaint=inpaint,
+                                 inpaint_method=inpaint_method,
+                                 force_regenerate=True,
+                                 make_wide_screen=True,
+                                 max_workers=render_workers)
 
     # 步骤 2: 读取 JSON 文件
     print("\n" + "=" * 60)
@@ -814,26 +960,38 @@ def create_ppt_from_paddle_json(json_file,
 
     font_name = "Calibri"
 
-    # 处理每一页
-    for page_idx in range(len(layout_results)):
-        print(f"处理第 {page_idx+1}/{len(layout_results)} 页...")
-        slide = presentation.Slides.Append()
-
-        page_layout = layout_results[page_idx]['prunedResult']
-        page_ocr = ocr_results[page_idx]['prunedResult']
-
-        parsing_res_list = page_layout.get('parsing_res_list', [])
-        ocr_boxes = page_ocr.get('rec_boxes', [])
-
-        # 处理文本块
-        process_text_blocks(slide, parsing_res_list, ocr_boxes, scale,
-                            ppt_width, ppt_height, font_name)
-
-        # 处理背景图片（包括前景元素提取和区域擦除）
-        if page_idx < len(png_files):
-            process_slide_background(slide, presentation, parsing_res_list,
-                                     png_files[page_idx], pdf_size, scale,
-                                     png_dir, page_idx)
+    # 背景图像处理随 PNG 渲染逐页提交到进程池，与主线程创建文本框并行；
+    # range 放在 zip 首位，页数用尽时不会多取一页 PNG
+    background_jobs = (
+        (layout_results[page_idx]['prunedResult'].get('parsing_res_list', []),
+         png_dir / png_name, pdf_size, scale, png_dir, page_idx, debug,
+         verbose)
+        for page_idx, png_name in zip(range(len(layout_results)), png_stream)
+    )
+    backgrounds = _run_background_jobs(background_jobs, max_workers=background_workers)
+
+    try:
+        # 处理每一页
+        for page_idx in range(len(layout_results)):
+            print(f"处理第 {page_idx+1}/{len(layout_results)} 页...")
+            slide = presentation.Slides.Append()
+
+            page_layout = layout_results[page_idx]['prunedResult']
+            page_ocr = ocr_results[page_idx]['prunedResult']
+
+            parsing_res_list = page_layout.get('parsing_res_list', [])
+            ocr_boxes = page_ocr.get('rec_boxes', [])
+
+            # 处理文本块
+            process_text_blocks(slide, parsing_res_list, ocr_boxes, scale,
+                                ppt_width, ppt_height, font_name, verbose=verbose)
+
+            # 处理背景图片（包括前景元素提取和区域擦除）；PNG 页数不足时跳过
+            apply_slide_background(slide, presentation, next(backgrounds, None))
+    finally:
+        # 结束流水线（包括出错时）：取消未开始的渲染任务，写入 PNG 缓存记录
+        backgrounds.close()
+        png_stream.close()
 
     # 保存并清理PPT
     if out_ppt_name is None:
@@ -870,6 +1028,8 @@ python create_with_paddle_reorg.py result.json input.pdf -o output --dpi 150
                         help="工作目录 (默认: output)")
     parser.add_argument('--name', type=str, default=None)
     parser.add_argument("--dpi", type=int, default=150, help="图片清晰度 (默认: 150)")
+    parser.add_argument("--debug", action="store_true", help="保存处理后的背景图到 png 目录")
+    parser.add_argument("--verbose", action="store_true", help="打印每个文本块和元素的详细信息")
 
     args = parser.parse_args()
 
@@ -881,7 +1041,9 @@ python create_with_paddle_reorg.py result.json input.pdf -o output --dpi 150
                                 args.pdf_file,
                                 str(out_dir),
                                 out_ppt_name=args.name,
-                                dpi=args.dpi)
+                                dpi=args.dpi,
+                                debug=args.debug,
+                                verbose=args.verbose)
 
 
 if __name__ == "__main__":